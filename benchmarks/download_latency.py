@@ -0,0 +1,81 @@
+"""
+Per-fetch overhead of utils.download.download against a local server that
+answers like the cache server, compared with a fresh requests.get per url.
+
+Usage: python -m benchmarks.download_latency [fetch count]
+"""
+import os
+import pickle
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from types import SimpleNamespace
+
+import cbor
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.download import download
+
+
+class CacheHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = cbor.dumps({
+        "url": "https://www.ics.uci.edu/", "status": 200,
+        "response": pickle.dumps({"content": b"<html></html>"})})
+
+    connections = 0
+
+    def setup(self):
+        CacheHandler.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main(count):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CacheHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    config = SimpleNamespace(
+        cache_server=(host, port), user_agent="benchmark", pool_size=4,
+        connect_timeout=5, read_timeout=60)
+    url = "https://www.ics.uci.edu/"
+
+    start = time.perf_counter()
+    for _ in range(count):
+        resp = requests.get(
+            f"http://{host}:{port}/",
+            params=[("q", url), ("u", config.user_agent)])
+        cbor.loads(resp.content)
+    fresh = (time.perf_counter() - start) / count
+    fresh_connections = CacheHandler.connections
+    CacheHandler.connections = 0
+
+    start = time.perf_counter()
+    for _ in range(count):
+        download(url, config)
+    pooled = (time.perf_counter() - start) / count
+    server.shutdown()
+
+    print(f"fetches: {count}")
+    print(
+        f"fresh requests.get: {fresh * 1e6:.0f} us/fetch, "
+        f"{fresh_connections} connections")
+    print(
+        f"pooled download: {pooled * 1e6:.0f} us/fetch, "
+        f"{CacheHandler.connections} connections")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,49 @@
+"""
+Memory and lookup rate of crawler.seen.SeenSet.
+
+Usage: python -m benchmarks.seen_set [url count]
+"""
+import os
+import sys
+import time
+from hashlib import sha256
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler.seen import SeenSet
+
+
+def digests(start, count):
+    return [sha256(str(i).encode()).digest() for i in range(start, start + count)]
+
+
+def main(count):
+    seen = SeenSet()
+    batch = 1000000
+    start = time.perf_counter()
+    for offset in range(0, count, batch):
+        for digest in digests(offset, min(batch, count - offset)):
+            seen.add(digest)
+    build = time.perf_counter() - start
+
+    sample = 1000000
+    hits = digests(0, sample)
+    misses = digests(count, sample)
+    start = time.perf_counter()
+    for digest in hits:
+        digest in seen
+    hit_rate = sample / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for digest in misses:
+        digest in seen
+    miss_rate = sample / (time.perf_counter() - start)
+
+    print(f"urls: {count}")
+    print(f"build: {build:.1f}s ({count / build:,.0f} adds/s)")
+    print(f"memory: {seen.memory_size() / count:.1f} bytes/url")
+    print(f"hit lookups: {hit_rate:,.0f}/s")
+    print(f"miss lookups: {miss_rate:,.0f}/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000000)
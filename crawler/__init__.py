@@ -1,6 +1,7 @@
 from utils import get_logger
 from crawler.frontier import Frontier
 from crawler.worker import Worker
+from crawler.parse_pool import close_parse_pool
 
 class Crawler(object):
     def __init__(self, config, restart, frontier_factory=Frontier, worker_factory=Worker):
@@ -19,7 +20,11 @@ class Crawler(object):
 
     def start(self):
         self.start_async()
-        self.join()
+        try:
+            self.join()
+        finally:
+            close_parse_pool()
+            self.frontier.close()
 
     def join(self):
         for worker in self.workers:
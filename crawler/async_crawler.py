@@ -0,0 +1,116 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import get_logger
+from utils.async_download import AsyncDownloader
+from utils.download import to_response
+from utils.response import Response
+from crawler.frontier import PoliteFrontier
+from crawler.parse_pool import get_parse_pool, close_parse_pool
+import scraper
+
+
+class AsyncCrawler(object):
+    ''' Crawler that runs every download on one asyncio event loop.
+
+    Up to config.async_limit downloads are in flight at once, each one a
+    coroutine holding a keep-alive connection to the cache server. Decoding
+    the response, scraper.scraper and the frontier calls are CPU-bound or
+    blocking, so they run on a pool of config.threads_count threads. With
+    config.parse_processes set, scraper.scraper runs in the parse pool
+    processes instead.
+
+    The frontier has to be thread safe and its get_tbd_url has to wait for
+    in-flight urls instead of returning None early, like PoliteFrontier.
+    get_tbd_url runs on a thread of its own, so waiting for a host to become
+    ready never blocks the event loop.
+    '''
+    def __init__(self, config, restart, frontier_factory=PoliteFrontier):
+        self.config = config
+        self.logger = get_logger("CRAWLER")
+        self.worker_logger = get_logger("AsyncWorker", "Worker")
+        self.frontier = frontier_factory(config, restart)
+
+    def start(self):
+        try:
+            asyncio.run(self._crawl())
+        finally:
+            close_parse_pool()
+            self.frontier.close()
+
+    async def _crawl(self):
+        loop = asyncio.get_running_loop()
+        downloader = AsyncDownloader(self.config, self.config.async_limit)
+        slots = asyncio.Semaphore(self.config.async_limit)
+        tasks = set()
+        with ThreadPoolExecutor(1) as dispatcher, \
+                ThreadPoolExecutor(self.config.threads_count) as processors:
+            while True:
+                await slots.acquire()
+                tbd_url = await loop.run_in_executor(
+                    dispatcher, self.frontier.get_tbd_url)
+                if not tbd_url:
+                    slots.release()
+                    self.logger.info("Frontier is empty. Stopping Crawler.")
+                    break
+                task = asyncio.ensure_future(
+                    self._crawl_url(tbd_url, downloader, processors, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        downloader.close()
+
+    async def _crawl_url(self, tbd_url, downloader, processors, slots):
+        try:
+            try:
+                status, content = await downloader.fetch(tbd_url)
+            except (OSError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError) as e:
+                status, content = None, repr(e)
+            loop = asyncio.get_running_loop()
+            parse_pool = get_parse_pool(self.config)
+            if parse_pool is None:
+                await loop.run_in_executor(
+                    processors, self._process, tbd_url, status, content)
+                return
+            resp = await loop.run_in_executor(
+                processors, self._decode, tbd_url, status, content)
+            # submit blocks while the parse pool is saturated.
+            parsed = await loop.run_in_executor(
+                processors, parse_pool.submit, tbd_url, resp)
+            try:
+                scraped_urls = await asyncio.wrap_future(parsed)
+            except Exception as e:
+                self.worker_logger.error(f"Failed to parse {tbd_url}: {e!r}")
+                scraped_urls = []
+            await loop.run_in_executor(
+                processors, self._complete, tbd_url, scraped_urls)
+        finally:
+            slots.release()
+
+    def _process(self, tbd_url, status, content):
+        resp = self._decode(tbd_url, status, content)
+        self._complete(tbd_url, scraper.scraper(tbd_url, resp))
+
+    def _decode(self, tbd_url, status, content):
+        if status is None:
+            self.worker_logger.error(
+                f"Cache server request failed with url {tbd_url}: {content}")
+            resp = Response({
+                "error": (
+                    f"Cache server request failed with url {tbd_url}: "
+                    f"{content}"),
+                "status": 0,
+                "url": tbd_url})
+        else:
+            resp = to_response(tbd_url, status, content, self.worker_logger)
+        self.worker_logger.info(
+            f"Downloaded {tbd_url}, status <{resp.status}>, "
+            f"using cache {self.config.cache_server}.")
+        return resp
+
+    def _complete(self, tbd_url, scraped_urls):
+        for scraped_url in scraped_urls:
+            self.frontier.add_url(scraped_url)
+        self.frontier.mark_url_complete(tbd_url)
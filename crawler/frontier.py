@@ -1,13 +1,32 @@
 import os
-import shelve
+import time
+import uuid
 
-from threading import Thread, RLock
+from threading import Thread, RLock, Condition
 from queue import Queue, Empty
+from collections import deque
+from hashlib import sha256
+from heapq import heappush, heappop
+from inspect import getsource
+from urllib.parse import urlparse
 
-from utils import get_logger, get_urlhash, normalize
+from utils import get_logger, get_urldigest, normalize
 from scraper import is_valid
+from crawler.store import FrontierStore, PENDING, FILTERED
+from crawler.seen import SeenSet
+
+
+def get_rules_version():
+    ''' Fingerprint of the url filtering rules. The save file is stamped
+    with it, so a resume only runs is_valid again when the rules changed. '''
+    return sha256(getsource(is_valid).encode("utf-8")).hexdigest()
+
 
 class Frontier(object):
+    # Workers sleep for config.time_delay after every download unless the
+    # frontier already spaces out requests to the same host.
+    enforces_politeness = False
+
     def __init__(self, config, restart):
         self.logger = get_logger("FRONTIER")
         self.config = config
@@ -22,10 +41,16 @@ class Frontier(object):
             # Save file does exists, but request to start from seed.
             self.logger.info(
                 f"Found save file {self.config.save_file}, deleting it.")
-            os.remove(self.config.save_file)
+            FrontierStore.remove(self.config.save_file)
+            if os.path.exists(self.seen_file):
+                os.remove(self.seen_file)
         # Load existing save file, or create one if it does not exist.
-        self.save = shelve.open(self.config.save_file)
+        self.save = FrontierStore(
+            self.config.save_file, self.config.flush_size,
+            self.config.flush_interval)
+        self.seen = self._load_seen()
         if restart:
+            self.save.rules_version = get_rules_version()
             for url in self.config.seed_urls:
                 self.add_url(url)
         else:
@@ -35,17 +60,51 @@ class Frontier(object):
                 for url in self.config.seed_urls:
                     self.add_url(url)
 
+    @property
+    def seen_file(self):
+        return f"{self.config.save_file}.seen"
+
+    def _load_seen(self):
+        ''' Load the set of discovered urls from the snapshot written by the
+        last clean close, or rebuild it from the save file if there is none. '''
+        seen = SeenSet.load(self.seen_file, self.save.get_meta("seen_snapshot"))
+        # Until the next clean close the snapshot falls behind the save file.
+        self.save.set_meta("seen_snapshot", None)
+        if seen is None:
+            seen = SeenSet.from_hashes(self.save.urlhashes())
+        return seen
+
     def _parse_save_file(self):
         ''' This function can be overridden for alternate saving techniques. '''
-        total_count = len(self.save)
+        rules_version = get_rules_version()
+        if self.save.rules_version == rules_version:
+            tbd_count = 0
+            for url in self.save.pending_urls():
+                self._push(url)
+                tbd_count += 1
+            self.logger.info(f"Found {tbd_count} urls to be downloaded.")
+            return
+        # The rules changed since the save file was written: check every url
+        # that is not complete again, including the ones rejected before.
+        open_count = 0
         tbd_count = 0
-        for url, completed in self.save.values():
-            if not completed and is_valid(url):
-                self.to_be_downloaded.append(url)
+        for urlhash, url, state in list(self.save.open_urls()):
+            open_count += 1
+            new_state = PENDING if is_valid(url) else FILTERED
+            if new_state != state:
+                self.save.set_state(urlhash, url, new_state)
+            if new_state == PENDING:
+                self._push(url)
                 tbd_count += 1
+        self.save.rules_version = rules_version
         self.logger.info(
-            f"Found {tbd_count} urls to be downloaded from {total_count} "
-            f"total urls discovered.")
+            f"Url filtering rules changed, found {tbd_count} urls to be "
+            f"downloaded from {open_count} urls not yet completed.")
+
+    def _push(self, url):
+        ''' Queue a url for download. Overridden by frontiers that keep their
+        pending urls in a different structure. '''
+        self.to_be_downloaded.append(url)
 
     def get_tbd_url(self):
         try:
@@ -55,18 +114,112 @@ class Frontier(object):
 
     def add_url(self, url):
         url = normalize(url)
-        urlhash = get_urlhash(url)
-        if urlhash not in self.save:
-            self.save[urlhash] = (url, False)
-            self.save.sync()
-            self.to_be_downloaded.append(url)
+        urldigest = get_urldigest(url)
+        # The seen set answers without touching the save file.
+        if self.seen.add(urldigest):
+            self.save[urldigest.hex()] = (url, False)
+            self._push(url)
     
     def mark_url_complete(self, url):
-        urlhash = get_urlhash(url)
-        if urlhash not in self.save:
+        urldigest = get_urldigest(url)
+        if urldigest not in self.seen:
             # This should not happen.
             self.logger.error(
                 f"Completed url {url}, but have not seen it before.")
 
-        self.save[urlhash] = (url, True)
-        self.save.sync()
+        self.save[urldigest.hex()] = (url, True)
+
+    def close(self):
+        ''' Flush buffered progress to the save file and snapshot the seen
+        set so the next start does not have to rebuild it. '''
+        token = uuid.uuid4().hex
+        self.seen.save(self.seen_file, token)
+        self.save.set_meta("seen_snapshot", token)
+        self.save.close()
+
+
+def get_host(url):
+    return urlparse(url).netloc.lower()
+
+
+class PoliteFrontier(Frontier):
+    ''' Thread safe frontier that keeps one queue per host.
+
+    Hosts with pending urls sit in a heap ordered by the time they are next
+    allowed to be contacted. get_tbd_url hands out a url from the first host
+    in that heap that is past its politeness delay, and only blocks when no
+    host is ready yet. A host has at most one download in flight: it re-enters
+    the heap config.time_delay seconds after mark_url_complete is called for
+    its url, which mirrors the sleep the plain Worker does after a download.
+    get_tbd_url returns None once every queue is empty and no download is in
+    flight, since an in-flight page may still add new urls.
+    '''
+    enforces_politeness = True
+
+    def __init__(self, config, restart):
+        self.lock = Condition(RLock())
+        self.host_queues = dict()
+        self.ready_hosts = list()
+        self.busy_hosts = set()
+        self.next_allowed = dict()
+        self.in_flight = 0
+        self._sequence = 0
+        super().__init__(config, restart)
+
+    def _schedule(self, host, ready_time):
+        # The sequence number keeps hosts with equal ready times in FIFO
+        # order and stops heapq from ever comparing host names.
+        self._sequence += 1
+        heappush(self.ready_hosts, (ready_time, self._sequence, host))
+        self.lock.notify()
+
+    def _push(self, url):
+        host = get_host(url)
+        with self.lock:
+            queue = self.host_queues.get(host)
+            if queue is None:
+                queue = self.host_queues[host] = deque()
+            queue.append(url)
+            if len(queue) == 1 and host not in self.busy_hosts:
+                self._schedule(
+                    host, max(time.monotonic(), self.next_allowed.get(host, 0)))
+
+    def get_tbd_url(self):
+        with self.lock:
+            while True:
+                if self.ready_hosts:
+                    wait = self.ready_hosts[0][0] - time.monotonic()
+                    if wait <= 0:
+                        _, _, host = heappop(self.ready_hosts)
+                        queue = self.host_queues[host]
+                        url = queue.popleft()
+                        if not queue:
+                            del self.host_queues[host]
+                        self.busy_hosts.add(host)
+                        self.in_flight += 1
+                        return url
+                    self.lock.wait(wait)
+                elif self.in_flight:
+                    self.lock.wait()
+                else:
+                    return None
+
+    def add_url(self, url):
+        with self.lock:
+            super().add_url(url)
+
+    def mark_url_complete(self, url):
+        host = get_host(url)
+        with self.lock:
+            super().mark_url_complete(url)
+            if host not in self.busy_hosts:
+                return
+            self.busy_hosts.discard(host)
+            self.in_flight -= 1
+            ready_time = time.monotonic() + self.config.time_delay
+            self.next_allowed[host] = ready_time
+            if host in self.host_queues:
+                self._schedule(host, ready_time)
+            # Wake every waiting worker: either a host will be ready soon, or
+            # this was the last download and they all have to stop.
+            self.lock.notify_all()
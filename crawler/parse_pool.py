@@ -0,0 +1,124 @@
+import multiprocessing
+import time
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Thread, Lock, Event, BoundedSemaphore
+from types import SimpleNamespace
+
+import scraper
+
+_pool = None
+_pool_lock = Lock()
+
+
+def get_parse_pool(config):
+    ''' The parse pool shared by every worker of this process, or None when
+    config.parse_processes is 0 and pages are parsed in the worker thread. '''
+    global _pool
+    if not config.parse_processes:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(
+                config.parse_processes, config.parse_batch_size,
+                config.parse_batch_delay)
+        return _pool
+
+
+def close_parse_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def parse_batch(pages):
+    ''' Run the scraper on a batch of pages inside a pool process. '''
+    links = list()
+    for url, status, resp_url, content in pages:
+        resp = SimpleNamespace(
+            url=resp_url, status=status, error=None,
+            raw_response=SimpleNamespace(url=resp_url, content=content))
+        links.append(scraper.scraper(url, resp))
+    return links
+
+
+class ParsePool(object):
+    ''' Runs scraper.scraper on downloaded pages in a pool of processes, so
+    parsing is not serialized with downloading by the GIL.
+
+    submit returns a Future for the scraped links right away and the worker
+    goes back to downloading. Pages are sent to the processes in batches of
+    batch_size, or after batch_delay seconds if the batch does not fill up,
+    to amortize the pickling and IPC. At most max_pending pages wait to be
+    parsed; beyond that submit blocks, so a slow parse stage holds back the
+    downloads instead of filling memory.
+
+    Only the url, status and page bytes cross the process boundary. The
+    scraper gets a stand-in response with the same attributes it reads from
+    utils.response.Response: url, status, error and raw_response.url and
+    raw_response.content.
+    '''
+    def __init__(self, processes, batch_size=8, batch_delay=0.05,
+                 max_pending=None):
+        self.executor = ProcessPoolExecutor(
+            processes, mp_context=multiprocessing.get_context("spawn"))
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.pending = BoundedSemaphore(
+            max_pending or 4 * processes * batch_size)
+        self.lock = Lock()
+        self.batch = list()
+        self.batch_started = None
+        self._closed = Event()
+        self._flusher = Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def submit(self, url, resp):
+        future = Future()
+        content = resp.raw_response.content if resp.raw_response else None
+        if resp.status != 200 or not content:
+            # Nothing to parse; the scraper rejects these right away.
+            future.set_result(scraper.scraper(url, resp))
+            return future
+        self.pending.acquire()
+        with self.lock:
+            if not self.batch:
+                self.batch_started = time.monotonic()
+            self.batch.append(
+                (future, (url, resp.status, resp.url, bytes(content))))
+            if len(self.batch) >= self.batch_size:
+                self._flush()
+        return future
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.batch_delay):
+            with self.lock:
+                if (self.batch and time.monotonic() - self.batch_started
+                        >= self.batch_delay):
+                    self._flush()
+
+    def _flush(self):
+        batch, self.batch = self.batch, list()
+        futures = [future for future, _ in batch]
+        result = self.executor.submit(parse_batch, [page for _, page in batch])
+        result.add_done_callback(
+            lambda result: self._resolve(futures, result))
+
+    def _resolve(self, futures, result):
+        error = result.exception()
+        links = [None] * len(futures) if error else result.result()
+        for future, page_links in zip(futures, links):
+            self.pending.release()
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(page_links)
+
+    def close(self):
+        self._closed.set()
+        with self.lock:
+            if self.batch:
+                self._flush()
+        self.executor.shutdown(wait=True)
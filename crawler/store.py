@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import time
+
+from threading import Thread, RLock, Event
+
+# States a url can be in inside the save file. FILTERED urls were discovered
+# but rejected by is_valid on resume; they are checked again when the rules
+# change.
+PENDING = 0
+COMPLETE = 1
+FILTERED = 2
+
+
+class FrontierStore(object):
+    ''' Save file for the Frontier with write-behind batching.
+
+    It replaces the shelve the Frontier used to sync after every url. Values
+    are (url, completed) tuples keyed by urlhash, just like the shelve, but
+    writes land in an in-memory buffer first. The buffer is written to a
+    SQLite database in WAL mode as one transaction once it holds flush_size
+    entries, or once flush_interval seconds have passed since the last flush,
+    whichever comes first. A background thread enforces the time threshold
+    when no writes arrive.
+
+    Durability window: a crash of the crawler process loses at most the
+    writes still buffered, that is at most flush_size urls or flush_interval
+    seconds of progress. Flushed transactions survive a process crash. With
+    synchronous=NORMAL a power loss can also drop the last few transactions,
+    but never leaves the file half written.
+
+    Resume: urls that are not complete are also kept in a separate covering
+    index, so pending_urls and open_urls read only that part of the file and
+    never touch the completed urls. The meta table stamps the version of the
+    is_valid rules the states were computed with.
+
+    Crash recovery: committed transactions are appended to the write ahead
+    log (<save file>-wal) and copied into the main file at checkpoints. On the
+    next open SQLite replays the committed tail of that log and discards a
+    torn, uncommitted tail, so the save file is always consistent. Lost urls
+    are simply rediscovered from the pages that linked to them.
+    '''
+    def __init__(self, path, flush_size=512, flush_interval=1.0):
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.lock = RLock()
+        self.buffer = dict()
+        self.last_flush = time.monotonic()
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "urlhash TEXT PRIMARY KEY, url TEXT NOT NULL, "
+            "state INTEGER NOT NULL) WITHOUT ROWID")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS open_urls "
+            "ON urls (state, url) WHERE state != 1")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._closed = Event()
+        self._flusher = Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    @staticmethod
+    def remove(path):
+        ''' Delete a save file together with its write ahead log. '''
+        for name in (path, f"{path}-wal", f"{path}-shm"):
+            if os.path.exists(name):
+                os.remove(name)
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self.lock:
+                if (self.buffer and time.monotonic() - self.last_flush
+                        >= self.flush_interval):
+                    self.flush()
+
+    def __contains__(self, urlhash):
+        return self.get(urlhash) is not None
+
+    def __getitem__(self, urlhash):
+        value = self.get(urlhash)
+        if value is None:
+            raise KeyError(urlhash)
+        return value
+
+    def __setitem__(self, urlhash, value):
+        url, completed = value
+        self.set_state(urlhash, url, COMPLETE if completed else PENDING)
+
+    def set_state(self, urlhash, url, state):
+        with self.lock:
+            self.buffer[urlhash] = (url, state)
+            if (len(self.buffer) >= self.flush_size
+                    or time.monotonic() - self.last_flush
+                    >= self.flush_interval):
+                self.flush()
+
+    def __len__(self):
+        with self.lock:
+            self.flush()
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def __bool__(self):
+        with self.lock:
+            return bool(self.buffer) or self.connection.execute(
+                "SELECT 1 FROM urls LIMIT 1").fetchone() is not None
+
+    def get(self, urlhash, default=None):
+        with self.lock:
+            if urlhash in self.buffer:
+                url, state = self.buffer[urlhash]
+            else:
+                row = self.connection.execute(
+                    "SELECT url, state FROM urls WHERE urlhash = ?",
+                    (urlhash,)).fetchone()
+                if row is None:
+                    return default
+                url, state = row
+        return url, state == COMPLETE
+
+    def values(self):
+        for _, url, state in self._select(
+                "SELECT urlhash, url, state FROM urls"):
+            yield url, state == COMPLETE
+
+    def pending_urls(self):
+        ''' Yield the urls still to be downloaded, in time proportional to
+        their number. '''
+        # The first condition repeats the one on the index, which is what
+        # lets SQLite pick the partial index for this query.
+        for _, url, _ in self._select(
+                "SELECT urlhash, url, state FROM urls "
+                "WHERE state != 1 AND state = 0"):
+            yield url
+
+    def open_urls(self):
+        ''' Yield (urlhash, url, state) for every url that is not complete,
+        including the ones filtered out by older rules. '''
+        return self._select(
+            "SELECT urlhash, url, state FROM urls WHERE state != 1")
+
+    def _select(self, query, parameters=()):
+        with self.lock:
+            self.flush()
+            cursor = self.connection.execute(query, parameters)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(4096)
+            if not rows:
+                break
+            yield from rows
+
+    def urlhashes(self):
+        for (urlhash,) in self._select("SELECT urlhash FROM urls"):
+            yield urlhash
+
+    def get_meta(self, key):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        ''' Store a value in the meta table, once every write buffered so far
+        is in the file. A value of None deletes the key. '''
+        with self.lock:
+            self.flush()
+            if value is None:
+                self.connection.execute(
+                    "DELETE FROM meta WHERE key = ?", (key,))
+            else:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    (key, value))
+
+    @property
+    def rules_version(self):
+        return self.get_meta("rules_version")
+
+    @rules_version.setter
+    def rules_version(self, version):
+        self.set_meta("rules_version", version)
+
+    def flush(self):
+        with self.lock:
+            self.last_flush = time.monotonic()
+            if not self.buffer or self.connection is None:
+                return
+            rows = [
+                (urlhash, url, state)
+                for urlhash, (url, state) in self.buffer.items()]
+            self.buffer.clear()
+            with self.connection:
+                self.connection.execute("BEGIN")
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO urls (urlhash, url, state) "
+                    "VALUES (?, ?, ?)", rows)
+
+    sync = flush
+
+    def close(self):
+        with self.lock:
+            if self.connection is None:
+                return
+            self._closed.set()
+            self.flush()
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.connection.close()
+            self.connection = None
@@ -3,6 +3,7 @@ from threading import Thread
 from inspect import getsource
 from utils.download import download
 from utils import get_logger
+from crawler.parse_pool import get_parse_pool
 import scraper
 import time
 
@@ -18,6 +19,7 @@ class Worker(Thread):
         super().__init__(daemon=True)
         
     def run(self):
+        parse_pool = get_parse_pool(self.config)
         while True:
             tbd_url = self.frontier.get_tbd_url()
             if not tbd_url:
@@ -27,8 +29,26 @@ class Worker(Thread):
             self.logger.info(
                 f"Downloaded {tbd_url}, status <{resp.status}>, "
                 f"using cache {self.config.cache_server}.")
-            scraped_urls = scraper.scraper(tbd_url, resp)
-            for scraped_url in scraped_urls:
-                self.frontier.add_url(scraped_url)
-            self.frontier.mark_url_complete(tbd_url)
-            time.sleep(self.config.time_delay)
+            if parse_pool is None:
+                self.complete(tbd_url, scraper.scraper(tbd_url, resp))
+            else:
+                # Keep downloading while the page is parsed in another
+                # process; the url is completed once its links are back.
+                parse_pool.submit(tbd_url, resp).add_done_callback(
+                    lambda future, tbd_url=tbd_url:
+                        self._complete_parsed(tbd_url, future))
+            if not getattr(self.frontier, "enforces_politeness", False):
+                time.sleep(self.config.time_delay)
+
+    def complete(self, tbd_url, scraped_urls):
+        for scraped_url in scraped_urls:
+            self.frontier.add_url(scraped_url)
+        self.frontier.mark_url_complete(tbd_url)
+
+    def _complete_parsed(self, tbd_url, future):
+        try:
+            scraped_urls = future.result()
+        except Exception as e:
+            self.logger.error(f"Failed to parse {tbd_url}: {e!r}")
+            scraped_urls = []
+        self.complete(tbd_url, scraped_urls)
@@ -4,14 +4,19 @@ from argparse import ArgumentParser
 from utils.server_registration import get_cache_server
 from utils.config import Config
 from crawler import Crawler
+from crawler.async_crawler import AsyncCrawler
+from crawler.frontier import PoliteFrontier
 
 
-def main(config_file, restart):
+def main(config_file, restart, engine):
     cparser = ConfigParser()
     cparser.read(config_file)
     config = Config(cparser)
     config.cache_server = get_cache_server(config, restart)
-    crawler = Crawler(config, restart)
+    if engine == "async":
+        crawler = AsyncCrawler(config, restart)
+    else:
+        crawler = Crawler(config, restart, frontier_factory=PoliteFrontier)
     crawler.start()
 
 
@@ -19,5 +24,7 @@ if __name__ == "__main__":
     parser = ArgumentParser()
     parser.add_argument("--restart", action="store_true", default=False)
     parser.add_argument("--config_file", type=str, default="config.ini")
+    parser.add_argument(
+        "--engine", choices=["threads", "async"], default="threads")
     args = parser.parse_args()
-    main(args.config_file, args.restart)
+    main(args.config_file, args.restart, args.engine)
@@ -0,0 +1,112 @@
+"""
+Test suite for the asyncio engine in crawler/async_crawler.py
+"""
+import unittest
+import sys
+import os
+import pickle
+import shutil
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from types import SimpleNamespace
+from urllib.parse import urlparse, parse_qs
+
+import cbor
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler.async_crawler import AsyncCrawler
+from crawler.store import FrontierStore
+
+HOSTS = ["www.ics.uci.edu", "www.cs.uci.edu", "www.stat.uci.edu"]
+PAGE_COUNT = 31
+
+
+def page_url(number):
+    return f"http://{HOSTS[number % len(HOSTS)]}/page/{number}"
+
+
+class GraphHandler(BaseHTTPRequestHandler):
+    """Serves a binary tree of pages spread over several hosts"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = parse_qs(urlparse(self.path).query)["q"][0]
+        number = int(url.rsplit("/", 1)[1])
+        links = "".join(
+            f'<a href="{page_url(child)}">child</a>'
+            for child in (2 * number + 1, 2 * number + 2)
+            if child < PAGE_COUNT)
+        raw_response = requests.Response()
+        raw_response.status_code = 200
+        raw_response.url = url
+        raw_response._content = f"<html><body>{links}</body></html>".encode()
+        body = cbor.dumps({
+            "url": url, "status": 200,
+            "response": pickle.dumps(raw_response)})
+        self.send_response(200)
+        if number % 2:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 100):
+                chunk = body[start:start + 100]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncCrawler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), GraphHandler)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.config = SimpleNamespace(
+            cache_server=self.server.server_address, user_agent="test",
+            connect_timeout=5, read_timeout=5, async_limit=8,
+            threads_count=2, time_delay=0, seed_urls=[page_url(0)],
+            save_file=os.path.join(self.directory, "frontier.db"),
+            flush_size=512, flush_interval=1.0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def pending_urls(self):
+        store = FrontierStore(self.config.save_file)
+        try:
+            return list(store.pending_urls())
+        finally:
+            store.close()
+
+    def test_crawls_whole_graph(self):
+        """Test that every page is downloaded, scraped and completed"""
+        crawler = AsyncCrawler(self.config, restart=True)
+        crawler.start()
+
+        self.assertEqual(len(crawler.frontier.seen), PAGE_COUNT)
+        self.assertEqual(self.pending_urls(), [])
+
+    def test_unreachable_server_completes_urls(self):
+        """Test that failed downloads are still marked complete"""
+        self.server.shutdown()
+        self.server.server_close()
+        crawler = AsyncCrawler(self.config, restart=True)
+        crawler.start()
+
+        self.assertEqual(len(crawler.frontier.seen), 1)
+        self.assertEqual(self.pending_urls(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Test suite for the pooled cache server connections in utils/download.py
+"""
+import unittest
+import sys
+import os
+import pickle
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from types import SimpleNamespace
+
+import cbor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.download import download
+
+
+class CacheHandler(BaseHTTPRequestHandler):
+    """Answers every request like the cache server would"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        CacheHandler.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        body = cbor.dumps({
+            "url": "http://www.ics.uci.edu/", "status": 200,
+            "response": pickle.dumps("page")})
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDownload(unittest.TestCase):
+
+    def setUp(self):
+        CacheHandler.connections = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CacheHandler)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.config = SimpleNamespace(
+            cache_server=self.server.server_address, user_agent="test",
+            pool_size=1, connect_timeout=5, read_timeout=5)
+        self.logger = logging.getLogger("test_download")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_downloads_reuse_connection(self):
+        """Test that consecutive downloads share one keep-alive connection"""
+        for _ in range(3):
+            resp = download("http://www.ics.uci.edu/", self.config, self.logger)
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(resp.raw_response, "page")
+
+        self.assertEqual(CacheHandler.connections, 1)
+
+    def test_unreachable_server_returns_error_response(self):
+        """Test that a failed request becomes a response with status 0"""
+        self.server.shutdown()
+        self.server.server_close()
+
+        with self.assertLogs(self.logger, level="ERROR"):
+            resp = download("http://www.ics.uci.edu/", self.config, self.logger)
+        self.assertEqual(resp.status, 0)
+        self.assertIsNotNone(resp.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
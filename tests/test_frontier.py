@@ -0,0 +1,190 @@
+"""
+Test suite for the per-host scheduling in crawler/frontier.py
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import time
+from threading import Thread
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler.frontier import Frontier, PoliteFrontier, get_rules_version
+from crawler.store import FrontierStore, FILTERED
+
+
+class MockConfig:
+    """Mock object to simulate utils.config.Config"""
+    def __init__(self, save_file, seed_urls, time_delay=0.2):
+        self.save_file = save_file
+        self.seed_urls = seed_urls
+        self.time_delay = time_delay
+        self.threads_count = 1
+        self.flush_size = 512
+        self.flush_interval = 1.0
+
+
+class TestPoliteFrontier(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.save_file = os.path.join(self.directory, "frontier.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_frontier(self, seed_urls, time_delay=0.2):
+        config = MockConfig(self.save_file, seed_urls, time_delay)
+        return PoliteFrontier(config, restart=True)
+
+    def test_distinct_hosts_are_ready_at_once(self):
+        """Test that urls from different hosts are handed out without waiting"""
+        frontier = self.make_frontier([
+            "https://www.ics.uci.edu/a",
+            "https://www.cs.uci.edu/a",
+            "https://www.stat.uci.edu/a"], time_delay=5)
+
+        start = time.monotonic()
+        urls = [frontier.get_tbd_url() for _ in range(3)]
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(sorted(urls), [
+            "https://www.cs.uci.edu/a",
+            "https://www.ics.uci.edu/a",
+            "https://www.stat.uci.edu/a"])
+
+    def test_same_host_waits_for_politeness_delay(self):
+        """Test that a host is not handed out again before its delay passes"""
+        frontier = self.make_frontier([
+            "https://www.ics.uci.edu/a",
+            "https://www.ics.uci.edu/b"], time_delay=0.3)
+
+        first = frontier.get_tbd_url()
+        frontier.mark_url_complete(first)
+        completed = time.monotonic()
+        second = frontier.get_tbd_url()
+
+        self.assertGreaterEqual(time.monotonic() - completed, 0.3)
+        self.assertEqual(
+            sorted([first, second]),
+            ["https://www.ics.uci.edu/a", "https://www.ics.uci.edu/b"])
+
+    def test_ready_host_is_not_blocked_by_waiting_host(self):
+        """Test that a ready host is served while another host cools down"""
+        frontier = self.make_frontier(
+            ["https://www.ics.uci.edu/a"], time_delay=5)
+        url = frontier.get_tbd_url()
+        frontier.add_url("https://www.ics.uci.edu/b")
+        frontier.add_url("https://www.stat.uci.edu/a")
+        frontier.mark_url_complete(url)
+
+        start = time.monotonic()
+        self.assertEqual(frontier.get_tbd_url(), "https://www.stat.uci.edu/a")
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_empty_frontier_returns_none(self):
+        """Test that None is returned once nothing is queued or in flight"""
+        frontier = self.make_frontier(["https://www.ics.uci.edu/a"])
+        url = frontier.get_tbd_url()
+        frontier.mark_url_complete(url)
+
+        self.assertIsNone(frontier.get_tbd_url())
+
+    def test_waits_for_in_flight_download(self):
+        """Test that an idle worker waits while another download may add urls"""
+        frontier = self.make_frontier(
+            ["https://www.ics.uci.edu/a"], time_delay=0)
+        url = frontier.get_tbd_url()
+        results = []
+        waiter = Thread(target=lambda: results.append(frontier.get_tbd_url()))
+        waiter.start()
+
+        time.sleep(0.1)
+        self.assertEqual(results, [])
+        frontier.add_url("https://www.ics.uci.edu/b")
+        frontier.mark_url_complete(url)
+        waiter.join(timeout=5)
+
+        self.assertEqual(results, ["https://www.ics.uci.edu/b"])
+
+
+class TestFrontierResume(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = MockConfig(
+            os.path.join(self.directory, "frontier.db"),
+            ["https://www.ics.uci.edu/a"])
+        frontier = Frontier(self.config, restart=True)
+        frontier.add_url("https://www.ics.uci.edu/b")
+        frontier.add_url("https://www.ics.uci.edu/c")
+        frontier.mark_url_complete("https://www.ics.uci.edu/a")
+        frontier.close()
+        # is_valid is replaced below, so pin the version it was saved with.
+        patcher = mock.patch(
+            "crawler.frontier.get_rules_version",
+            return_value=get_rules_version())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_resume_loads_pending_without_filtering(self):
+        """Test that a resume with unchanged rules does not call is_valid"""
+        with mock.patch("crawler.frontier.is_valid") as is_valid:
+            frontier = Frontier(self.config, restart=False)
+
+        is_valid.assert_not_called()
+        self.assertEqual(sorted(frontier.to_be_downloaded), [
+            "https://www.ics.uci.edu/b", "https://www.ics.uci.edu/c"])
+        frontier.close()
+
+    def test_resume_loads_seen_set_snapshot(self):
+        """Test that a clean close lets the next start skip the rebuild"""
+        with mock.patch("crawler.frontier.SeenSet.from_hashes") as from_hashes:
+            frontier = Frontier(self.config, restart=False)
+
+        from_hashes.assert_not_called()
+        self.assertEqual(len(frontier.seen), 3)
+        frontier.close()
+
+    def test_resume_after_crash_rebuilds_seen_set(self):
+        """Test that a stale snapshot is ignored and the set is rebuilt"""
+        crashed = Frontier(self.config, restart=False)
+        crashed.add_url("https://www.ics.uci.edu/d")
+        crashed.save.flush()
+
+        frontier = Frontier(self.config, restart=False)
+        self.assertEqual(len(frontier.seen), 4)
+        frontier.close()
+
+    def test_resume_filters_again_when_rules_change(self):
+        """Test that changed rules re-filter only the urls not completed"""
+        store = FrontierStore(self.config.save_file)
+        store.rules_version = "older rules"
+        store.close()
+
+        def reject_c(url):
+            return not url.endswith("/c")
+
+        with mock.patch("crawler.frontier.is_valid", side_effect=reject_c) \
+                as is_valid:
+            frontier = Frontier(self.config, restart=False)
+
+        self.assertEqual(is_valid.call_count, 2)
+        self.assertEqual(
+            frontier.to_be_downloaded, ["https://www.ics.uci.edu/b"])
+        urlhash, = [
+            urlhash for urlhash, url, state in frontier.save.open_urls()
+            if state == FILTERED]
+        self.assertEqual(
+            frontier.save[urlhash], ("https://www.ics.uci.edu/c", False))
+        frontier.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Test suite for the in-memory seen set in crawler/seen.py
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler.seen import SeenSet
+from utils import get_urldigest, get_urlhash
+
+
+def make_urls(count):
+    return [f"https://www.ics.uci.edu/page/{i}" for i in range(count)]
+
+
+class TestSeenSet(unittest.TestCase):
+
+    def test_add_reports_new_digests(self):
+        """Test that add returns True only the first time"""
+        seen = SeenSet()
+        digest = get_urldigest("https://www.ics.uci.edu/a")
+
+        self.assertTrue(seen.add(digest))
+        self.assertFalse(seen.add(digest))
+        self.assertIn(digest, seen)
+        self.assertNotIn(get_urldigest("https://www.ics.uci.edu/b"), seen)
+        self.assertEqual(len(seen), 1)
+
+    def test_growth_keeps_members(self):
+        """Test that resizing the table keeps every digest"""
+        seen = SeenSet(capacity=16)
+        digests = [get_urldigest(url) for url in make_urls(1000)]
+        for digest in digests:
+            seen.add(digest)
+
+        self.assertEqual(len(seen), 1000)
+        self.assertTrue(all(digest in seen for digest in digests))
+        self.assertNotIn(get_urldigest("https://www.ics.uci.edu/other"), seen)
+
+    def test_from_hashes_matches_digests(self):
+        """Test that a set rebuilt from hex hashes finds the same urls"""
+        urls = make_urls(100)
+        seen = SeenSet.from_hashes(get_urlhash(url) for url in urls)
+
+        self.assertTrue(all(get_urldigest(url) in seen for url in urls))
+
+
+class TestSeenSetSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "frontier.db.seen")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        """Test that a snapshot loads back with the same members"""
+        seen = SeenSet()
+        digests = [get_urldigest(url) for url in make_urls(200)]
+        for digest in digests:
+            seen.add(digest)
+        seen.save(self.path, "token")
+
+        loaded = SeenSet.load(self.path, "token")
+        self.assertEqual(len(loaded), 200)
+        self.assertTrue(all(digest in loaded for digest in digests))
+
+    def test_load_rejects_other_token(self):
+        """Test that a snapshot from another session is ignored"""
+        SeenSet().save(self.path, "token")
+
+        self.assertIsNone(SeenSet.load(self.path, "other"))
+        self.assertIsNone(SeenSet.load(self.path, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
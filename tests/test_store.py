@@ -0,0 +1,80 @@
+"""
+Test suite for the write-behind save file in crawler/store.py
+"""
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler.store import FrontierStore
+
+
+class TestFrontierStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "frontier.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def count_rows(self):
+        # Read through a second connection, like a crawler restarting.
+        reader = FrontierStore(self.path)
+        try:
+            return reader.connection.execute(
+                "SELECT COUNT(*) FROM urls").fetchone()[0]
+        finally:
+            reader.close()
+
+    def test_reads_see_buffered_writes(self):
+        """Test that buffered writes are visible before they are flushed"""
+        store = FrontierStore(self.path, flush_size=100, flush_interval=60)
+        store["a"] = ("http://ics.uci.edu/a", False)
+        store["a"] = ("http://ics.uci.edu/a", True)
+
+        self.assertIn("a", store)
+        self.assertNotIn("b", store)
+        self.assertEqual(store["a"], ("http://ics.uci.edu/a", True))
+        self.assertEqual(self.count_rows(), 0)
+        store.close()
+
+    def test_flushes_on_size_threshold(self):
+        """Test that a full buffer is written out as one batch"""
+        store = FrontierStore(self.path, flush_size=3, flush_interval=60)
+        for name in "abc":
+            store[name] = (f"http://ics.uci.edu/{name}", False)
+
+        self.assertEqual(store.buffer, {})
+        self.assertEqual(self.count_rows(), 3)
+        store.close()
+
+    def test_close_persists_buffer(self):
+        """Test that closing flushes and a reopened store sees everything"""
+        store = FrontierStore(self.path, flush_size=100, flush_interval=60)
+        store["a"] = ("http://ics.uci.edu/a", True)
+        store["b"] = ("http://ics.uci.edu/b", False)
+        store.close()
+
+        reopened = FrontierStore(self.path)
+        self.assertEqual(len(reopened), 2)
+        self.assertEqual(sorted(reopened.values()), [
+            ("http://ics.uci.edu/a", True), ("http://ics.uci.edu/b", False)])
+        reopened.close()
+
+    def test_remove_deletes_log_files(self):
+        """Test that remove deletes the database and its write ahead log"""
+        store = FrontierStore(self.path, flush_size=1)
+        store["a"] = ("http://ics.uci.edu/a", False)
+        store.close()
+        FrontierStore.remove(self.path)
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(f"{self.path}-wal"))
+
+
+if __name__ == '__main__':
+    unittest.main()
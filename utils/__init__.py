@@ -22,12 +22,15 @@ def get_logger(name, filename=None):
     return logger
 
 
-def get_urlhash(url):
+def get_urldigest(url):
     parsed = urlparse(url)
     # everything other than scheme.
     return sha256(
         f"{parsed.netloc}/{parsed.path}/{parsed.params}/"
-        f"{parsed.query}/{parsed.fragment}".encode("utf-8")).hexdigest()
+        f"{parsed.query}/{parsed.fragment}".encode("utf-8")).digest()
+
+def get_urlhash(url):
+    return get_urldigest(url).hex()
 
 def normalize(url):
     if url.endswith("/"):
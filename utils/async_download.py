@@ -0,0 +1,97 @@
+import asyncio
+
+from urllib.parse import urlencode
+
+
+class AsyncDownloader(object):
+    ''' Fetches urls from the cache server on an asyncio event loop.
+
+    This is the asyncio counterpart of utils.download.download. It speaks
+    plain HTTP/1.1 over asyncio streams and keeps up to max_connections
+    keep-alive connections to the cache server, so each in-flight download
+    costs a socket and a coroutine instead of a thread. fetch only returns
+    the status code and the raw body; decoding them with
+    utils.download.to_response is CPU-bound and left to the caller.
+    '''
+    def __init__(self, config, max_connections):
+        self.host, self.port = config.cache_server
+        self.user_agent = config.user_agent
+        self.connect_timeout = config.connect_timeout
+        self.read_timeout = config.read_timeout
+        self.idle = list()
+        self.connections = asyncio.Semaphore(max_connections)
+
+    async def fetch(self, url):
+        query = urlencode([("q", url), ("u", self.user_agent)])
+        request = (
+            f"GET /?{query} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"Connection: keep-alive\r\n\r\n").encode("latin-1")
+        async with self.connections:
+            if self.idle:
+                connection = self.idle.pop()
+                try:
+                    return await self._exchange(connection, request)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    # The server closed the idle connection; try a new one.
+                    pass
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                self.connect_timeout)
+            return await self._exchange(connection, request)
+
+    async def _exchange(self, connection, request):
+        reader, writer = connection
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, body, keep_alive = await asyncio.wait_for(
+                self._read_response(reader), self.read_timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self.idle.append(connection)
+        else:
+            writer.close()
+        return status, body
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Cache server closed the connection.")
+        version, status = status_line.split(None, 2)[:2]
+        headers = dict()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        keep_alive = (
+            version == b"HTTP/1.1" and headers.get("connection") != "close")
+        if headers.get("transfer-encoding") == "chunked":
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return int(status), body, keep_alive
+
+    async def _read_chunked(self, reader):
+        chunks = list()
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                # Skip trailers up to the blank line that ends the body.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
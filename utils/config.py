@@ -8,10 +8,25 @@ class Config(object):
         assert self.user_agent != "DEFAULT AGENT", "Set useragent in config.ini"
         assert re.match(r"^[a-zA-Z0-9_ ,]+$", self.user_agent), "User agent should not have any special characters outside '_', ',' and 'space'"
         self.threads_count = int(config["LOCAL PROPERTIES"]["THREADCOUNT"])
+        self.async_limit = int(
+            config["LOCAL PROPERTIES"].get("ASYNCLIMIT", 1000))
+        self.parse_processes = int(
+            config["LOCAL PROPERTIES"].get("PARSERS", 0))
+        self.parse_batch_size = int(
+            config["LOCAL PROPERTIES"].get("PARSEBATCH", 8))
+        self.parse_batch_delay = float(
+            config["LOCAL PROPERTIES"].get("PARSEBATCHDELAY", 0.05))
         self.save_file = config["LOCAL PROPERTIES"]["SAVE"]
+        self.flush_size = int(config["LOCAL PROPERTIES"].get("FLUSHSIZE", 512))
+        self.flush_interval = float(
+            config["LOCAL PROPERTIES"].get("FLUSHINTERVAL", 1.0))
 
         self.host = config["CONNECTION"]["HOST"]
         self.port = int(config["CONNECTION"]["PORT"])
+        self.pool_size = int(config["CONNECTION"].get("POOLSIZE", 4))
+        self.connect_timeout = float(
+            config["CONNECTION"].get("CONNECTTIMEOUT", 5))
+        self.read_timeout = float(config["CONNECTION"].get("READTIMEOUT", 60))
 
         self.seed_urls = config["CRAWLER"]["SEEDURL"].split(",")
         self.time_delay = float(config["CRAWLER"]["POLITENESS"])
@@ -1,21 +1,61 @@
 import requests
 import cbor
 import time
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from utils.response import Response
 
+# One session per thread: requests.Session is not guaranteed to be thread safe,
+# but each one keeps its connections to the cache server alive between calls.
+_local = threading.local()
+
+def get_session(config):
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        # A keep-alive socket the server already closed fails when reused.
+        # Retrying the GET once on a fresh connection hides that, while a
+        # server that is really down still fails after one more attempt.
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=config.pool_size,
+            max_retries=Retry(total=1))
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        _local.session = session
+    return session
+
 def download(url, config, logger=None):
     host, port = config.cache_server
-    resp = requests.get(
-        f"http://{host}:{port}/",
-        params=[("q", f"{url}"), ("u", f"{config.user_agent}")])
     try:
-        if resp and resp.content:
-            return Response(cbor.loads(resp.content))
+        resp = get_session(config).get(
+            f"http://{host}:{port}/",
+            params=[("q", f"{url}"), ("u", f"{config.user_agent}")],
+            timeout=(config.connect_timeout, config.read_timeout))
+    except requests.exceptions.RequestException as e:
+        # Drop the session so the next download starts with a new pool.
+        _local.session = None
+        logger.error(f"Cache server request failed with url {url}: {e}")
+        return Response({
+            "error": f"Cache server request failed with url {url}: {e}",
+            "status": 0,
+            "url": url})
+    return to_response(url, resp.status_code, resp.content, logger)
+
+def to_response(url, status_code, content, logger=None):
+    ''' Decode the body the cache server sent for url. '''
+    try:
+        if status_code < 400 and content:
+            return Response(cbor.loads(content))
     except (EOFError, ValueError) as e:
         pass
-    logger.error(f"Spacetime Response error {resp} with url {url}.")
+    logger.error(
+        f"Spacetime Response error <Response [{status_code}]> with url {url}.")
     return Response({
-        "error": f"Spacetime Response error {resp} with url {url}.",
-        "status": resp.status_code,
+        "error": (
+            f"Spacetime Response error <Response [{status_code}]> "
+            f"with url {url}."),
+        "status": status_code,
         "url": url})